@@ -14,16 +14,75 @@ exchange.
 
 import datetime as dt
 import json
+import logging
+import logging.handlers
+import queue
 import sqlite3
+import sys
 import threading
-from typing import List, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # orjson parses the ticker payloads faster; fall back to the stdlib
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = dt.datetime(1970, 1, 1)
+
+# Prices, quantities and balances are fixed-point integers in units of 1e-8,
+# the precision Binance quotes with
+_SCALE = 10**8
+
+
+def _to_micros(timestamp: dt.datetime) -> int:
+    """Convert a naive UTC datetime to integer microseconds since the epoch."""
+    return (timestamp - _EPOCH) // dt.timedelta(microseconds=1)
+
+
+def _from_micros(micros: int) -> dt.datetime:
+    """Convert integer microseconds since the epoch to a naive UTC datetime."""
+    return _EPOCH + dt.timedelta(microseconds=micros)
+
+
+def _to_fixed(value) -> int:
+    """Convert a decimal amount (number or numeric string) to fixed-point."""
+    return round(float(value) * _SCALE)
+
+
+def _from_fixed(value: int) -> float:
+    """Convert a fixed-point amount back to a float for display."""
+    return value / _SCALE
 
 
 class TradingSimulator:
     """A simple moving‑average crossover trading simulator for crypto."""
 
+    # (connect, read) timeouts in seconds for Binance requests
+    _HTTP_TIMEOUT = (3.05, 10)
+
+    # Smallest amount of cash worth placing a buy order for
+    _MIN_ORDER = _to_fixed(0.0001)
+
+    # Bumped whenever the table layout changes; stored in PRAGMA user_version
+    _SCHEMA_VERSION = 2
+
+    # SQL reused on every tick; sqlite3 caches the prepared statements by text
+    _INSERT_PRICE_SQL = "INSERT OR REPLACE INTO prices (timestamp, symbol, price) VALUES (?, ?, ?)"
+    _INSERT_TRADE_SQL = (
+        "INSERT INTO trades (timestamp, symbol, action, price, quantity, balance) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+
     def __init__(
         self,
         symbols: List[str],
@@ -41,21 +100,92 @@ class TradingSimulator:
         self.long_ma = long_ma
         self.position_size_fraction = position_size_fraction
 
-        # set up database
+        # HTTP session so the TLS connection to Binance is kept alive;
+        # transient errors and rate limiting are retried with backoff
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        self._session.mount("https://", adapter)
+        # Workers for per-symbol fetches when the batch request fails
+        self._pool = ThreadPoolExecutor(max_workers=min(8, max(1, len(symbols))))
+
+        # set up database; the connections are not tied to the creating
+        # thread, and this lock serialises all use of the write connection
+        self._db_lock = threading.Lock()
         self._init_db(starting_balance)
+        self._pending_trades: List[tuple] = []
+
+        # Ring buffers of the last `long_ma` prices, one row per symbol, kept
+        # in memory so the strategy never has to read prices back from
+        # SQLite. Running sums of the last `short_ma` and `long_ma` prices
+        # make the moving averages O(1) per tick, and keeping every symbol
+        # in one matrix lets a tick update and evaluate them all at once.
+        # Prices are fixed-point, so the sums are exact integers. The averages
+        # from each symbol's previous update are cached, with a flag marking
+        # whether its window was full, for the crossover test. The sums and
+        # cached averages are computed by `_load_windows`.
+        self._row: Dict[str, int] = {symbol: row for row, symbol in enumerate(symbols)}
+        self._prices_matrix = np.zeros((len(symbols), self.long_ma), dtype=np.int64)
+        self._ring_i = np.zeros(len(symbols), dtype=np.intp)
+        self._count = np.zeros(len(symbols), dtype=np.intp)
+        self._load_windows()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode with the shared PRAGMAs."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        # WAL journal with relaxed syncing keeps per-tick writes cheap
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
 
     def _init_db(self, starting_balance: float) -> None:
-        """Initialise SQLite database with required tables."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        # Table to store price history
+        """
+        Open the database connections and create the required tables.
+        With WAL enabled SQLite allows one writer alongside any number of
+        readers, so all mutations go through `_wconn` inside explicit
+        BEGIN IMMEDIATE transactions while SELECTs use `_rconn`.
+        """
+        self._wconn = self._connect()
+        c = self._wconn.cursor()
+        c.execute("BEGIN IMMEDIATE")
+        version = c.execute("PRAGMA user_version").fetchone()[0]
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prices'")
+        if version < self._SCHEMA_VERSION and c.fetchone() is not None:
+            self._migrate(c, version)
+        self._create_tables(c)
+        c.execute(f"PRAGMA user_version = {self._SCHEMA_VERSION}")
+        # Initialise cash balance if not present
+        c.execute("SELECT balance FROM cash WHERE id = 1")
+        row = c.fetchone()
+        if row is None:
+            c.execute("INSERT INTO cash (id, balance) VALUES (1, ?)", (_to_fixed(starting_balance),))
+        c.execute("COMMIT")
+        self._rconn = self._connect()
+        self._rconn.execute("PRAGMA query_only=ON")
+        self._load_account()
+
+    def _create_tables(self, c: sqlite3.Cursor) -> None:
+        """Create any missing tables using the current schema."""
+        # Table to store price history; timestamps are microseconds since the
+        # epoch and the primary key doubles as the per-symbol history index.
+        # Prices, quantities and balances in all tables are fixed-point.
         c.execute(
             """
             CREATE TABLE IF NOT EXISTS prices (
-                timestamp TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
                 symbol TEXT NOT NULL,
-                price REAL NOT NULL,
-                PRIMARY KEY (timestamp, symbol)
+                price INTEGER NOT NULL,
+                PRIMARY KEY (symbol, timestamp)
             )
             """
         )
@@ -64,12 +194,12 @@ class TradingSimulator:
             """
             CREATE TABLE IF NOT EXISTS trades (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
                 symbol TEXT NOT NULL,
                 action TEXT NOT NULL,
-                price REAL NOT NULL,
-                quantity REAL NOT NULL,
-                balance REAL NOT NULL
+                price INTEGER NOT NULL,
+                quantity INTEGER NOT NULL,
+                balance INTEGER NOT NULL
             )
             """
         )
@@ -78,7 +208,7 @@ class TradingSimulator:
             """
             CREATE TABLE IF NOT EXISTS portfolio (
                 symbol TEXT PRIMARY KEY,
-                quantity REAL NOT NULL
+                quantity INTEGER NOT NULL
             )
             """
         )
@@ -87,186 +217,325 @@ class TradingSimulator:
             """
             CREATE TABLE IF NOT EXISTS cash (
                 id INTEGER PRIMARY KEY CHECK (id = 1),
-                balance REAL NOT NULL
+                balance INTEGER NOT NULL
             )
             """
         )
-        # Initialise cash balance if not present
+
+    def _migrate(self, c: sqlite3.Cursor, version: int) -> None:
+        """
+        Convert a database written by an older version to the current schema.
+        Version 0 stored ISO timestamp strings keyed by (timestamp, symbol);
+        versions before 2 stored prices, quantities and balances as REAL.
+        """
+        c.execute("DROP INDEX IF EXISTS idx_prices_symbol_ts")
+        for table in ("prices", "trades", "portfolio", "cash"):
+            c.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+        self._create_tables(c)
+
+        def micros(ts):
+            return _to_micros(dt.datetime.fromisoformat(ts)) if version < 1 else ts
+
+        c.execute("SELECT timestamp, symbol, price FROM prices_old")
+        c.executemany(
+            self._INSERT_PRICE_SQL,
+            [(micros(ts), symbol, _to_fixed(price)) for ts, symbol, price in c.fetchall()],
+        )
+        c.execute("SELECT id, timestamp, symbol, action, price, quantity, balance FROM trades_old")
+        c.executemany(
+            """
+            INSERT INTO trades (id, timestamp, symbol, action, price, quantity, balance)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (trade_id, micros(ts), symbol, action, _to_fixed(price), _to_fixed(qty), _to_fixed(balance))
+                for trade_id, ts, symbol, action, price, qty, balance in c.fetchall()
+            ],
+        )
+        c.execute("SELECT symbol, quantity FROM portfolio_old")
+        c.executemany(
+            "INSERT INTO portfolio (symbol, quantity) VALUES (?, ?)",
+            [(symbol, _to_fixed(qty)) for symbol, qty in c.fetchall()],
+        )
+        c.execute("SELECT id, balance FROM cash_old")
+        c.executemany(
+            "INSERT INTO cash (id, balance) VALUES (?, ?)",
+            [(cash_id, _to_fixed(balance)) for cash_id, balance in c.fetchall()],
+        )
+        for table in ("prices", "trades", "portfolio", "cash"):
+            c.execute(f"DROP TABLE {table}_old")
+
+    def _load_account(self) -> None:
+        """Load the cash balance and open positions into memory."""
+        c = self._rconn.cursor()
         c.execute("SELECT balance FROM cash WHERE id = 1")
         row = c.fetchone()
-        if row is None:
-            c.execute("INSERT INTO cash (id, balance) VALUES (1, ?)", (starting_balance,))
-        conn.commit()
-        conn.close()
+        self._cash: int = row[0] if row else 0
+        c.execute("SELECT symbol, quantity FROM portfolio")
+        self._positions: Dict[str, int] = dict(c.fetchall())
+
+    def close(self) -> None:
+        """Close the HTTP session, fetch workers and the database connections."""
+        self._pool.shutdown(wait=False)
+        self._session.close()
+        with self._db_lock:
+            self._rconn.close()
+            self._wconn.close()
 
-    def _fetch_price(self, symbol: str) -> float:
+    def _fetch_prices(self) -> Dict[str, int]:
         """
-        Fetch the latest price for a symbol from Binance API.
-        This uses the public ticker price endpoint. Returns the price as float.
+        Fetch the latest prices for all symbols from Binance API.
+        This uses the public ticker price endpoint with the ``symbols``
+        parameter so that every symbol is returned by a single request. If
+        Binance rejects that request with 400 (one unknown symbol fails the
+        whole batch), the symbols are fetched individually in parallel
+        instead. Any other failure (rate limiting or server errors that
+        outlasted the retries, connection errors, timeouts) skips the tick
+        rather than sending more requests.
+        Returns a mapping of symbol to fixed-point price for the symbols that
+        succeeded.
         """
-        url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
+        url = "https://api.binance.com/api/v3/ticker/price"
+        params = {"symbols": json.dumps(self.symbols, separators=(",", ":"))}
         try:
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, params=params, timeout=self._HTTP_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
-            return float(data["price"])
+            data = _json_loads(response.content)
+            return {item["symbol"]: _to_fixed(item["price"]) for item in data}
+        except requests.HTTPError as e:
+            logger.warning("Error fetching prices for %s: %s", ", ".join(self.symbols), e)
+            if e.response is None or e.response.status_code != 400:
+                return {}
         except Exception as e:
-            print(f"Error fetching price for {symbol}: {e}")
+            logger.warning("Error fetching prices for %s: %s", ", ".join(self.symbols), e)
+            return {}
+
+        futures = [(symbol, self._pool.submit(self._fetch_price, symbol)) for symbol in self.symbols]
+        prices = {}
+        for symbol, future in futures:
+            price = future.result()
+            if price is not None:
+                prices[symbol] = price
+        return prices
+
+    def _fetch_price(self, symbol: str) -> Optional[int]:
+        """
+        Fetch the latest price for a single symbol from Binance API.
+        Returns the price as fixed-point, or None if the request failed.
+        """
+        url = "https://api.binance.com/api/v3/ticker/price"
+        try:
+            response = self._session.get(url, params={"symbol": symbol}, timeout=self._HTTP_TIMEOUT)
+            response.raise_for_status()
+            data = _json_loads(response.content)
+            return _to_fixed(data["price"])
+        except Exception as e:
+            logger.warning("Error fetching price for %s: %s", symbol, e)
             return None
 
-    def _store_price(self, timestamp: dt.datetime, symbol: str, price: float) -> None:
-        """Store price into the database."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(
-            "INSERT OR REPLACE INTO prices (timestamp, symbol, price) VALUES (?, ?, ?)",
-            (timestamp.isoformat(), symbol, price),
+    def _store_prices(self, timestamp: int, prices: Dict[str, int]) -> None:
+        """Store the prices fetched for one tick into the database."""
+        c = self._wconn.cursor()
+        c.executemany(
+            self._INSERT_PRICE_SQL,
+            [(timestamp, symbol, price) for symbol, price in prices.items()],
         )
-        conn.commit()
-        conn.close()
 
-    def _get_recent_prices(self, symbol: str, periods: int) -> List[float]:
+    def _get_recent_prices(self, symbol: str, periods: int) -> List[int]:
         """Retrieve the most recent `periods` prices for a symbol."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        c = self._rconn.cursor()
         c.execute(
             "SELECT price FROM prices WHERE symbol = ? ORDER BY timestamp DESC LIMIT ?",
             (symbol, periods),
         )
         rows = c.fetchall()
-        conn.close()
         return [row[0] for row in reversed(rows)]  # return in chronological order
 
-    def _get_cash_balance(self) -> float:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT balance FROM cash WHERE id = 1")
-        row = c.fetchone()
-        conn.close()
-        return row[0] if row else 0.0
-
-    def _update_cash_balance(self, new_balance: float) -> None:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("UPDATE cash SET balance = ? WHERE id = 1", (new_balance,))
-        conn.commit()
-        conn.close()
-
-    def _get_portfolio_quantity(self, symbol: str) -> float:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT quantity FROM portfolio WHERE symbol = ?", (symbol,))
-        row = c.fetchone()
-        conn.close()
-        return row[0] if row else 0.0
-
-    def _update_portfolio_quantity(self, symbol: str, quantity: float) -> None:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        if quantity == 0:
-            c.execute("DELETE FROM portfolio WHERE symbol = ?", (symbol,))
-        else:
-            c.execute(
-                "INSERT OR REPLACE INTO portfolio (symbol, quantity) VALUES (?, ?)",
-                (symbol, quantity),
-            )
-        conn.commit()
-        conn.close()
-
     def _log_trade(
         self,
-        timestamp: dt.datetime,
+        timestamp: int,
         symbol: str,
         action: str,
-        price: float,
-        quantity: float,
-        balance: float,
+        price: int,
+        quantity: int,
+        balance: int,
     ) -> None:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(
-            """
-            INSERT INTO trades (timestamp, symbol, action, price, quantity, balance)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (timestamp.isoformat(), symbol, action, price, quantity, balance),
+        """Queue a trade row; queued trades are written once per tick."""
+        self._pending_trades.append(
+            (timestamp, symbol, action, price, quantity, balance)
         )
-        conn.commit()
-        conn.close()
 
-    def _execute_trade(self, symbol: str, action: str, price: float) -> None:
+    def _flush_trades(self) -> None:
+        """
+        Write all trades queued during the current tick, together with the
+        resulting cash balance and the positions of the symbols traded.
+        """
+        if not self._pending_trades:
+            return
+        c = self._wconn.cursor()
+        c.executemany(self._INSERT_TRADE_SQL, self._pending_trades)
+        c.execute("UPDATE cash SET balance = ? WHERE id = 1", (self._cash,))
+        traded = {trade[1] for trade in self._pending_trades}
+        c.executemany(
+            "INSERT OR REPLACE INTO portfolio (symbol, quantity) VALUES (?, ?)",
+            [(symbol, self._positions[symbol]) for symbol in traded if symbol in self._positions],
+        )
+        c.executemany(
+            "DELETE FROM portfolio WHERE symbol = ?",
+            [(symbol,) for symbol in traded if symbol not in self._positions],
+        )
+        self._pending_trades.clear()
+
+    def _execute_trade(self, timestamp: int, symbol: str, action: str, price: int) -> None:
         """
         Execute a virtual trade. For buy actions, we spend a fraction of the cash
         balance; for sell actions we liquidate the entire position of the symbol.
+        Only the in-memory account is updated here; the database is brought up
+        to date for all of the tick's trades at once by `_flush_trades`.
         """
-        timestamp = dt.datetime.utcnow()
-        cash = self._get_cash_balance()
-        quantity_owned = self._get_portfolio_quantity(symbol)
+        when = _from_micros(timestamp)
+        cash = self._cash
+        quantity_owned = self._positions.get(symbol, 0)
 
         if action == "BUY":
             # Determine the amount to invest based on position_size_fraction
-            spend = cash * self.position_size_fraction
-            if spend < 0.0001:
+            spend = int(cash * self.position_size_fraction)
+            if spend < self._MIN_ORDER:
                 # Too little cash to place an order
-                print(f"{timestamp}: Not enough cash to buy {symbol}")
+                logger.info("%s: Not enough cash to buy %s", when, symbol)
                 return
-            qty = spend / price
+            qty = spend * _SCALE // price
             new_cash = cash - spend
             new_qty = quantity_owned + qty
-            self._update_cash_balance(new_cash)
-            self._update_portfolio_quantity(symbol, new_qty)
+            self._cash = new_cash
+            self._positions[symbol] = new_qty
             self._log_trade(timestamp, symbol, action, price, qty, new_cash)
-            print(f"{timestamp}: Bought {qty:.6f} {symbol} at {price:.2f}, new cash balance {new_cash:.2f}")
+            logger.info(
+                "%s: Bought %.6f %s at %.2f, new cash balance %.2f",
+                when, _from_fixed(qty), symbol, _from_fixed(price), _from_fixed(new_cash),
+            )
         elif action == "SELL" and quantity_owned > 0:
             # Sell entire position
             qty = quantity_owned
-            proceeds = qty * price
+            proceeds = qty * price // _SCALE
             new_cash = cash + proceeds
-            self._update_cash_balance(new_cash)
-            self._update_portfolio_quantity(symbol, 0.0)
+            self._cash = new_cash
+            del self._positions[symbol]
             self._log_trade(timestamp, symbol, action, price, -qty, new_cash)
-            print(f"{timestamp}: Sold {qty:.6f} {symbol} at {price:.2f}, new cash balance {new_cash:.2f}")
+            logger.info(
+                "%s: Sold %.6f %s at %.2f, new cash balance %.2f",
+                when, _from_fixed(qty), symbol, _from_fixed(price), _from_fixed(new_cash),
+            )
         else:
             # No action needed
             pass
 
-    def _evaluate_strategy(self, symbol: str) -> None:
+    def _load_windows(self) -> None:
+        """Fill the price windows from the stored price history."""
+        size = self._prices_matrix.shape[1]
+        for symbol, row in self._row.items():
+            history = self._get_recent_prices(symbol, periods=size)
+            self._prices_matrix[row, : len(history)] = history
+            self._count[row] = len(history)
+            self._ring_i[row] = len(history) % size
+        # sums of the last k stored prices from cumulative sums along each row
+        cs = np.zeros((len(self._row), size + 1), dtype=np.int64)
+        np.cumsum(self._prices_matrix, axis=1, out=cs[:, 1:])
+        rows = np.arange(len(self._row))
+        n = self._count
+        self._short_sum = cs[rows, n] - cs[rows, np.maximum(n - self.short_ma, 0)]
+        self._long_sum = cs[rows, n] - cs[rows, np.maximum(n - self.long_ma, 0)]
+        self._short_prev, self._long_prev, self._prev_ready = self._moving_averages(rows)
+
+    def _moving_averages(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Evaluate the strategy for the given symbol and execute trades accordingly.
-        The strategy: if the short moving average crosses above the long moving
-        average, buy; if it crosses below, sell; otherwise, hold.
+        Return the short and long moving averages for the given rows, both
+        multiplied by `short_ma * long_ma` so they stay exact integers that
+        compare like the true averages, and a mask of rows with a full window.
+        The products are taken as Python ints (object arrays) since they can
+        exceed the int64 range for long windows of high-priced symbols.
         """
-        prices = self._get_recent_prices(symbol, periods=self.long_ma + 1)
-        if len(prices) < self.long_ma + 1:
-            # Not enough data yet
-            return
-        # compute moving averages excluding the current price
-        short_ma_old = sum(prices[-(self.short_ma + 1):-1]) / self.short_ma
-        long_ma_old = sum(prices[-(self.long_ma + 1):-1]) / self.long_ma
-        short_ma_new = sum(prices[-self.short_ma:]) / self.short_ma
-        long_ma_new = sum(prices[-self.long_ma:]) / self.long_ma
-
-        # Determine crossovers
-        if short_ma_old <= long_ma_old and short_ma_new > long_ma_new:
-            # Golden cross: buy signal
-            current_price = prices[-1]
-            self._execute_trade(symbol, "BUY", current_price)
-        elif short_ma_old >= long_ma_old and short_ma_new < long_ma_new:
-            # Death cross: sell signal
-            current_price = prices[-1]
-            self._execute_trade(symbol, "SELL", current_price)
-        else:
-            # Hold
-            pass
+        ready = self._count[rows] == self.long_ma
+        short_ma = self._short_sum[rows].astype(object) * self.long_ma
+        long_ma = self._long_sum[rows].astype(object) * self.short_ma
+        return short_ma, long_ma, ready
+
+    def _push_prices(self, prices: Dict[str, int]) -> np.ndarray:
+        """
+        Write each symbol's new price into its ring buffer and update its sums.
+        Returns the matrix rows of the symbols, in the order of `prices`.
+        """
+        rows = np.fromiter((self._row[symbol] for symbol in prices), dtype=np.intp, count=len(prices))
+        new = np.fromiter(prices.values(), dtype=np.int64, count=len(prices))
+        matrix = self._prices_matrix
+        size = self.long_ma
+        i = self._ring_i[rows]
+        count = self._count[rows]
+        # drop the prices that are about to fall out of each moving-average
+        # window; the ring holds exactly `long_ma` prices, so the one leaving
+        # the long window is the one in the slot about to be overwritten
+        short_out = np.where(count >= self.short_ma, matrix[rows, (i - self.short_ma) % size], 0)
+        long_out = np.where(count == size, matrix[rows, i], 0)
+        matrix[rows, i] = new
+        self._short_sum[rows] += new - short_out
+        self._long_sum[rows] += new - long_out
+        self._ring_i[rows] = (i + 1) % size
+        self._count[rows] = np.minimum(count + 1, size)
+        return rows
+
+    def _evaluate_strategy(self, timestamp: int, prices: Dict[str, int], rows: np.ndarray) -> None:
+        """
+        Evaluate the strategy for the symbols priced this tick and execute
+        trades accordingly. The strategy: if the short moving average crosses
+        above the long moving average, buy; if it crosses below, sell;
+        otherwise, hold. `prices` are the freshly fetched prices, already
+        pushed into the ring buffers at `rows`, so nothing is read back from
+        the database. The moving averages for all symbols are computed in
+        one vectorized pass; only the resulting signals are handled in Python.
+        """
+        symbols = list(prices)
+
+        short_ma_old = self._short_prev[rows]
+        long_ma_old = self._long_prev[rows]
+        ready_old = self._prev_ready[rows]
+        short_ma_new, long_ma_new, ready_new = self._moving_averages(rows)
+        self._short_prev[rows] = short_ma_new
+        self._long_prev[rows] = long_ma_new
+        self._prev_ready[rows] = ready_new
+
+        # Determine crossovers; both windows must have been full
+        ready = ready_old & ready_new
+        # Golden cross: buy signal
+        buy = ready & (short_ma_old <= long_ma_old) & (short_ma_new > long_ma_new)
+        # Death cross: sell signal
+        sell = ready & (short_ma_old >= long_ma_old) & (short_ma_new < long_ma_new)
+        for k in np.flatnonzero(buy | sell):
+            symbol = symbols[k]
+            self._execute_trade(timestamp, symbol, "BUY" if buy[k] else "SELL", prices[symbol])
 
     def _job(self):
         """Job executed at each scheduled interval."""
-        timestamp = dt.datetime.utcnow()
-        for symbol in self.symbols:
-            price = self._fetch_price(symbol)
-            if price is not None:
-                self._store_price(timestamp, symbol, price)
-                self._evaluate_strategy(symbol)
+        # one integer timestamp (microseconds since the epoch) for the whole tick
+        timestamp = time.time_ns() // 1000
+        prices = self._fetch_prices()
+        if not prices:
+            return
+        # All writes for this tick share one transaction (and one fsync)
+        with self._db_lock:
+            self._wconn.execute("BEGIN IMMEDIATE")
+            try:
+                self._store_prices(timestamp, prices)
+                rows = self._push_prices(prices)
+                self._evaluate_strategy(timestamp, prices, rows)
+                self._flush_trades()
+                self._wconn.commit()
+            except Exception:
+                self._pending_trades.clear()
+                self._wconn.rollback()
+                # discard in-memory account and window changes made during this tick
+                self._load_account()
+                self._load_windows()
+                raise
 
     def run(self) -> None:
         """
@@ -274,23 +543,51 @@ class TradingSimulator:
 
         At each iteration it fetches the latest price data, stores it in the
         database and evaluates the trading strategy for each symbol. The loop
-        then sleeps until the next interval. This implementation avoids
-        external scheduling libraries and relies on Python's built‑in
-        threading.Event to wait between iterations.
+        then sleeps until the next interval. Deadlines are scheduled on the
+        monotonic clock so wall-clock adjustments do not skew the interval,
+        and a tick that overruns the interval pushes the schedule back
+        rather than being followed by catch-up ticks.
         """
-        print(
-            f"Trading simulator started. Fetching prices every {self.fetch_interval_minutes} minutes."
+        logger.info(
+            "Trading simulator started. Fetching prices every %s minutes.", self.fetch_interval_minutes
         )
-        while True:
-            start_time = dt.datetime.utcnow()
-            self._job()
-            elapsed = (dt.datetime.utcnow() - start_time).total_seconds()
-            sleep_seconds = max(0, self.fetch_interval_minutes * 60 - elapsed)
-            threading.Event().wait(sleep_seconds)
+        interval = self.fetch_interval_minutes * 60
+        deadline = time.monotonic()
+        try:
+            while True:
+                self._job()
+                deadline += interval
+                now = time.monotonic()
+                if deadline < now:
+                    # the tick overran the interval; restart the schedule
+                    # from now instead of firing missed ticks back-to-back
+                    deadline = now
+                time.sleep(deadline - now)
+        except KeyboardInterrupt:
+            self.close()
+            raise
+
+
 
+def _configure_logging() -> logging.handlers.QueueListener:
+    """
+    Route log records through a queue so that writing to stdout happens on
+    a background thread instead of blocking the tick loop. Returns the
+    started listener; stop it to flush pending records.
+    """
+    log_queue: queue.Queue = queue.Queue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    listener.start()
+    return listener
 
 
 def main():
+    listener = _configure_logging()
     # Define the symbols to trade: using Binance symbols like BTCUSDT and ETHUSDT
     symbols = ["BTCUSDT", "ETHUSDT"]
     simulator = TradingSimulator(
@@ -305,7 +602,9 @@ def main():
     try:
         simulator.run()
     except (KeyboardInterrupt, SystemExit):
-        print("Simulator stopped.")
+        logger.info("Simulator stopped.")
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":